@@ -11,10 +11,31 @@ import time
 import logging
 import csv
 import random
+import signal
+import re
 from datetime import datetime, timedelta
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, MemoryHandler
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+# Playwright is imported by load_playwright() on first browser setup, so runs that exit early
+# (e.g. "too soon to run again" from a frequent cron job) skip its import cost entirely.
+# Everything that uses these names runs after setup_browser()
+sync_playwright = None
+PlaywrightTimeoutError = None
+
+
+def load_playwright():
+    """Import Playwright into the module globals above (no-op after the first call)"""
+    global sync_playwright, PlaywrightTimeoutError
+    if sync_playwright is None:
+        from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+
+# Optional faster JSON for state.json (pip install orjson); falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
@@ -49,7 +70,16 @@ def setup_logging():
     console_formatter = logging.Formatter('%(message)s')
     console_handler.setFormatter(console_formatter)
 
-    logger.addHandler(file_handler)
+    # Buffer file writes - records go to disk 100 at a time instead of one write per line.
+    # Warnings and errors flush right away, and logging's exit hook flushes the rest - so
+    # problems ("⚠️", "❌", "Error ...") are logged at WARNING/ERROR, not INFO
+    buffered_file_handler = MemoryHandler(
+        capacity=100,
+        flushLevel=logging.WARNING,
+        target=file_handler
+    )
+
+    logger.addHandler(buffered_file_handler)
     logger.addHandler(console_handler)
 
     return logger
@@ -57,6 +87,30 @@ def setup_logging():
 # Initialize logger
 logger = setup_logging()
 
+def int_setting(name, default, minimum, unit=None, zero_means=None):
+    """
+    Read an integer setting from the environment, falling back to the default if it is invalid.
+    unit and zero_means only describe the default in the warning, e.g. "5 seconds" or "0 = unlimited"
+    """
+    try:
+        value = int(os.getenv(name, default))
+        if value < minimum:
+            raise ValueError(f"{name} must be at least {minimum}")
+        return value
+    except ValueError as e:
+        if default == 0 and zero_means:
+            default_label = f"0 = {zero_means}"
+        elif unit:
+            default_label = f"{default} {unit}"
+        else:
+            default_label = default
+        logger.warning(f"⚠️  Invalid {name} value, using default ({default_label}): {e}")
+        return default
+
+def profile_has_session(path):
+    """True if a browser profile directory exists and is not empty, i.e. may hold a login"""
+    return os.path.isdir(path) and bool(os.listdir(path))
+
 # Configuration with validation
 TIKTOK_USERNAME = os.getenv('TIKTOK_USERNAME')
 TIKTOK_PASSWORD = os.getenv('TIKTOK_PASSWORD')
@@ -64,154 +118,642 @@ LOGIN_METHOD = os.getenv('LOGIN_METHOD', 'email').lower()  # 'email' or 'google'
 
 # Validate login method
 if LOGIN_METHOD not in ['email', 'google']:
-    logger.info(f"⚠️  Invalid LOGIN_METHOD '{LOGIN_METHOD}', using 'email'")
+    logger.warning(f"⚠️  Invalid LOGIN_METHOD '{LOGIN_METHOD}', using 'email'")
     LOGIN_METHOD = 'email'
 
-try:
-    UNFOLLOW_DELAY = int(os.getenv('UNFOLLOW_DELAY', 10800))  # 3 hours default
-    if UNFOLLOW_DELAY < 0:
-        raise ValueError("UNFOLLOW_DELAY must be positive")
-except ValueError as e:
-    logger.info(f"⚠️  Invalid UNFOLLOW_DELAY value, using default (10800 seconds): {e}")
-    UNFOLLOW_DELAY = 10800
+UNFOLLOW_DELAY = int_setting('UNFOLLOW_DELAY', 10800, minimum=0, unit='seconds')  # 3 hours default
+BATCH_SIZE = int_setting('BATCH_SIZE', 5, minimum=1)
+ACTION_DELAY = int_setting('ACTION_DELAY', 5, minimum=0, unit='seconds')
 
-try:
-    BATCH_SIZE = int(os.getenv('BATCH_SIZE', 5))
-    if BATCH_SIZE < 1:
-        raise ValueError("BATCH_SIZE must be at least 1")
-except ValueError as e:
-    logger.info(f"⚠️  Invalid BATCH_SIZE value, using default (5): {e}")
-    BATCH_SIZE = 5
+# Delay between profile checks (to avoid bot detection)
+PROFILE_CHECK_DELAY = int_setting('PROFILE_CHECK_DELAY', 30, minimum=0, unit='seconds')
 
-try:
-    ACTION_DELAY = int(os.getenv('ACTION_DELAY', 5))
-    if ACTION_DELAY < 0:
-        raise ValueError("ACTION_DELAY must be positive")
-except ValueError as e:
-    logger.info(f"⚠️  Invalid ACTION_DELAY value, using default (5 seconds): {e}")
-    ACTION_DELAY = 5
+# File paths
+STATE_FILE = 'state.json'
+SESSION_FILE = 'session.json'
+LOG_FILE = 'tiktok_unfollower.log'
+CSV_EXPORT_FILE = 'invalid_accounts.csv'
+# Append-only audit log of unfollows, one JSON object per line (kept out of state.json so
+# state saves don't re-serialize the whole history)
+UNFOLLOWED_LOG_FILE = 'unfollowed.jsonl'
 
-# Delay between profile checks (to avoid bot detection)
-try:
-    PROFILE_CHECK_DELAY = int(os.getenv('PROFILE_CHECK_DELAY', 30))
-    if PROFILE_CHECK_DELAY < 0:
-        raise ValueError("PROFILE_CHECK_DELAY must be positive")
-except ValueError as e:
-    logger.info(f"⚠️  Invalid PROFILE_CHECK_DELAY value, using default (30 seconds): {e}")
-    PROFILE_CHECK_DELAY = 30
+# Session persistence - saves login state to avoid logging in every time
+SAVE_SESSION = os.getenv('SAVE_SESSION', 'true').lower() == 'true'
 
-HEADLESS = os.getenv('HEADLESS', 'false').lower() == 'true'
+# Optional on-disk browser profile (e.g. .profiles/tiktok). When set, the browser keeps its
+# cookies, local storage and IndexedDB there itself and session.json is not used
+BROWSER_PROFILE_DIR = os.path.expanduser(os.getenv('BROWSER_PROFILE_DIR', '').strip())
+
+# Headless by default once a saved session exists - the first login may need a visible
+# browser for MFA or Google sign-in. A leftover session.json only counts while SAVE_SESSION
+# loads it. An explicit HEADLESS value always wins. When the default turned headless on but
+# the saved login has expired, login() reopens the browser with a window
+if BROWSER_PROFILE_DIR:
+    _session_saved = profile_has_session(BROWSER_PROFILE_DIR)
+else:
+    _session_saved = SAVE_SESSION and os.path.exists(SESSION_FILE)
+HEADLESS = os.getenv('HEADLESS', str(_session_saved)).lower() == 'true'
+HEADLESS_DEFAULTED = 'HEADLESS' not in os.environ
+
+# Daemon mode - keep the process and browser running and repeat the cleanup every
+# UNFOLLOW_DELAY seconds, instead of relying on cron/Task Scheduler to restart the script
+DAEMON = os.getenv('DAEMON', 'false').lower() == 'true'
 
 # Safety mode - when enabled, the script will scan and report but NOT actually unfollow
 DRY_RUN = os.getenv('DRY_RUN', 'true').lower() == 'true'
 
 # Limit how many followers to review (helpful for testing)
 # Set to 0 or leave empty to review all followers
-try:
-    MAX_FOLLOWERS_TO_REVIEW = int(os.getenv('MAX_FOLLOWERS_TO_REVIEW', 0))
-    if MAX_FOLLOWERS_TO_REVIEW < 0:
-        raise ValueError("MAX_FOLLOWERS_TO_REVIEW must be non-negative")
-except ValueError as e:
-    logger.info(f"⚠️  Invalid MAX_FOLLOWERS_TO_REVIEW value, using default (0 = unlimited): {e}")
-    MAX_FOLLOWERS_TO_REVIEW = 0
-
-# Session persistence - saves login state to avoid logging in every time
-SAVE_SESSION = os.getenv('SAVE_SESSION', 'true').lower() == 'true'
-
-# File paths
-STATE_FILE = 'state.json'
-SESSION_FILE = 'session.json'
-LOG_FILE = 'tiktok_unfollower.log'
-CSV_EXPORT_FILE = 'invalid_accounts.csv'
+MAX_FOLLOWERS_TO_REVIEW = int_setting('MAX_FOLLOWERS_TO_REVIEW', 0, minimum=0, zero_means='unlimited')
+
+# Resource blocking - the script only reads page text and DOM structure, so images,
+# videos, fonts and analytics beacons are wasted bandwidth and render time
+BLOCK_RESOURCES = os.getenv('BLOCK_RESOURCES', 'true').lower() == 'true'
+
+# Browser engine to launch: 'chromium' (default), 'firefox' or 'webkit'
+BROWSER = os.getenv('BROWSER', 'chromium').lower()
+if BROWSER not in ['chromium', 'firefox', 'webkit']:
+    logger.warning(f"⚠️  Invalid BROWSER '{BROWSER}', using 'chromium'")
+    BROWSER = 'chromium'
+
+# Optional long-lived Chromium to attach to (e.g. http://localhost:9222, started with
+# --remote-debugging-port) - skips browser cold start and keeps cookies in its profile
+BROWSER_CDP_URL = os.getenv('BROWSER_CDP_URL', '').strip()
+
+# Unfollows are written to state.json in groups of this size (and always at the end of a run)
+STATE_SAVE_INTERVAL = 5
+
+# Most recent processed accounts remembered in state.json (TikTok caps following at 10,000,
+# so older entries are for accounts long gone from the list); the oldest are evicted first
+PROCESSED_ACCOUNTS_LIMIT = 100000
+
+# Invalid verdicts from profile checks are kept in state.json for PROFILE_VERDICT_TTL seconds
+# (7 days), so an invalid account that wasn't unfollowed yet - unconfirmed click, batch stopped
+# early - isn't visited again next run. Valid accounts don't need this, they are marked
+# processed. Oldest verdicts are evicted past PROFILE_VERDICT_LIMIT
+PROFILE_VERDICT_TTL = 7 * 24 * 3600
+PROFILE_VERDICT_LIMIT = 10000
+
+# Upper bound on time spent scrolling the following modal, in case TikTok silently stops
+# returning rows. The quiet period that ends a scroll burst backs off from SCROLL_WAIT_MIN_MS
+# to SCROLL_WAIT_MAX_MS while nothing loads
+SCROLL_TIME_LIMIT = 600
+SCROLL_WAIT_MIN_MS = 500
+SCROLL_WAIT_MAX_MS = 4000
+# Longest single in-page scroll burst, so progress is logged and rows harvested regularly
+SCROLL_BURST_MS = 5000
+
+# Toast text TikTok shows when it throttles follow/unfollow actions. When one appears, the
+# unfollow is retried up to UNFOLLOW_RETRIES times with exponential backoff capped at
+# THROTTLE_BACKOFF_CAP seconds; if it persists the batch is stopped
+THROTTLE_TOAST_SELECTOR = 'text=/doing that too (much|fast)|too many (requests|attempts)|try again later/i'
+UNFOLLOW_RETRIES = 3
+THROTTLE_BACKOFF_CAP = 300
+
+# Runs an invalid account may fail to unfollow (row or button not found, click unconfirmed)
+# before it is marked processed and left for a manual unfollow - otherwise the same stuck
+# accounts would fill every later batch
+UNFOLLOW_ATTEMPT_LIMIT = 3
+
+# The follow-info modal that lists the accounts you follow (the JS snippets query the same selector)
+FOLLOWING_MODAL_SELECTOR = '[role="dialog"][data-e2e="follow-info-popup"]'
+
+# Messages sidebar item - it only appears when logged in, so it doubles as the login check.
+# The attribute selector goes first: it's a plain CSS match, while the text selectors scan
+# every text node and only serve as fallbacks for builds where the link changes
+MESSAGES_SELECTORS = (
+    '[href*="/messages"]',  # Link to messages
+    'text=Messages',  # Text content
+    'a:has-text("Messages")',  # Link containing Messages text
+)
+
+# Fallbacks for the Following count on the profile page (XPath when starting with //)
+FOLLOWING_BUTTON_SELECTORS = (
+    '[data-e2e="following-count"]',
+    'strong[title="Following"]',
+    '//strong[@title="Following"]/..',
+)
+
+# XPaths for the "Following" tab in the follow-info modal (a div with the label and a count)
+FOLLOWING_TAB_SELECTORS = (
+    # Look for div containing both "Following" text and a count
+    '//div[contains(@class, "DivTabItem") and .//div[text()="Following"]]',
+    # Alternative: look for any clickable element with "Following" in the tabs area
+    '//div[contains(@class, "DivTabs")]//div[text()="Following"]/..',
+)
+
+# Chromium flags: hide the automation flag, and turn off GPU, background throttling and other
+# subsystems a DOM-scraping session never uses. --no-sandbox is intentionally not included.
+# Don't add --disable-features here: Chromium keeps only the last copy of a switch, which would
+# replace Playwright's own --disable-features list (it already covers Translate and MediaRouter)
+CHROMIUM_ARGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-sync',
+    '--mute-audio',
+)
+
+# Requests aborted when BLOCK_RESOURCES is enabled
+# Stylesheets are kept so visibility checks and click targets behave normally
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+# URL fragments of TikTok telemetry/monitoring beacons and third-party trackers
+BLOCKED_URL_PATTERNS = (
+    'tiktokv.com/monitor',
+    'mon.tiktokv',
+    'mcs.tiktokw',
+    'log-va',
+    'log.byteoversea',
+    'analytics.tiktok',
+    'google-analytics',
+    'googletagmanager',
+    'doubleclick',
+)
+
+# Case-insensitive profile page patterns, matched against the raw page text in one pass each.
+# ['’] covers the typographic apostrophe TikTok renders in some locales
+NOT_FOUND_PROFILE_RE = re.compile(r"couldn['’]t find this account|account not found", re.IGNORECASE)
+BANNED_PROFILE_RE = re.compile(r"banned", re.IGNORECASE)
+ACCOUNT_WORD_RE = re.compile(r"account", re.IGNORECASE)
+
+# Shown when an account has never posted
+EMPTY_PROFILE_RE = re.compile(r"no content|hasn['’]t posted", re.IGNORECASE)
+
+# Reads everything check_if_account_invalid() needs from a profile page in one evaluate call:
+# whether TikTok's "Refresh" error is shown, the page text, and the number of video items
+# (from the first video selector that matches anything)
+PROFILE_SNAPSHOT_JS = '''
+() => {
+    const text = document.body ? document.body.innerText : '';
+    const videoSelectors = [
+        '[data-e2e="user-post-item"]',  // Individual video items
+        '[class*="DivItemContainer"]',  // Video container
+        'div[data-e2e="user-post-item-list"] > div',  // Videos in the list
+    ];
+    let videoCount = 0;
+    for (const selector of videoSelectors) {
+        videoCount = document.querySelectorAll(selector).length;
+        if (videoCount > 0) break;
+    }
+    return {hasRefresh: /refresh/i.test(text), text: text, videoCount: videoCount};
+}
+'''
+
+# Resolves once a profile shows what check_if_account_invalid() looks for: video items, or one
+# of the Refresh / not found / banned / empty messages (keep in step with the *_PROFILE_RE
+# patterns). Replaces a fixed sleep after each profile navigation. With ignoreRefresh, a
+# Refresh prompt doesn't count - used after clicking Refresh, while the old prompt is still shown
+PROFILE_READY_JS = '''
+({ignoreRefresh}) => {
+    if (document.querySelector('[data-e2e="user-post-item"], [class*="DivItemContainer"], div[data-e2e="user-post-item-list"] > div')) {
+        return true;
+    }
+    const text = document.body ? document.body.innerText : '';
+    if (!ignoreRefresh && /refresh/i.test(text)) {
+        return true;
+    }
+    return /couldn['’]t find this account|account not found|banned|no content|hasn['’]t posted/i.test(text);
+}
+'''
+# How long to wait for PROFILE_READY_JS before checking the profile anyway (milliseconds), and how
+# often to re-test it - innerText forces a layout, so not on every animation frame
+PROFILE_READY_TIMEOUT_MS = 8000
+PROFILE_READY_POLL_MS = 250
+
+# Injected into every page so rows in the following modal paint without fade-in animations.
+# The style tag is only referenced from this closure (no id or global that TikTok's scripts
+# could look for), so it is added only once, and a MutationObserver on <html>/<head> (direct
+# children only - cheap) puts it back if TikTok's client-side rendering drops it
+DISABLE_ANIMATIONS_SCRIPT = '''
+(() => {
+    const style = document.createElement('style');
+    style.textContent = '*, *::before, *::after {' +
+        'animation-duration: 0s !important;' +
+        'transition-duration: 0s !important;' +
+        'scroll-behavior: auto !important; }';
+    const inject = () => {
+        if (style.isConnected) return;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    const watch = () => {
+        inject();
+        const observer = new MutationObserver(inject);
+        observer.observe(document.documentElement, {childList: true});
+        if (document.head) observer.observe(document.head, {childList: true});
+    };
+    if (document.documentElement) {
+        watch();
+    } else {
+        document.addEventListener('DOMContentLoaded', watch);
+    }
+})();
+'''
+
+# Reads {index, username, href} for rows of the following modal from startIndex onwards,
+# plus the total row count, in one evaluate call. Also run at the end of every scroll burst
+# (see SCROLL_FOLLOWERS_JS) so each row is harvested once, as soon as it renders.
+# Username comes from the data-e2e attribute (an exact attribute match), falling back to the
+# PUniqueId class - class substring matching has to scan every class token of the row
+EXTRACT_FOLLOWERS_JS = '''
+(startIndex) => {
+    const modal = document.querySelector('[role="dialog"][data-e2e="follow-info-popup"]');
+    if (!modal) return {total: 0, rows: []};
+    const items = modal.querySelectorAll('li');
+    const total = items.length || modal.querySelectorAll('[class*="DivUserContainer"]').length;
+    const rows = [];
+    for (let index = startIndex; index < items.length; index++) {
+        const item = items[index];
+        const textOf = (selector) => {
+            const elem = item.querySelector(selector);
+            return elem ? elem.innerText.trim() : '';
+        };
+        const link = item.querySelector('a[href*="/@"]');
+        rows.push({
+            index: index,
+            username: textOf('[data-e2e="following-username"]') || textOf('[class*="PUniqueId"]'),
+            href: link ? link.getAttribute('href') : null
+        });
+    }
+    return {total: total, rows: rows};
+}
+'''
+
+# Scrolls the following modal's list in a burst inside the page: keeps scrolling to the bottom
+# while a MutationObserver sees rows being added, and once the list has been quiet for idleMs or
+# burstMs has elapsed resolves with EXTRACT_FOLLOWERS_JS's {total, rows} for rows from
+# startIndex on. One evaluate per burst covers scrolling, waiting, counting and harvesting.
+# The scroll container is looked up again on each burst (a few querySelector calls) rather than
+# cached on window, so nothing the page's own scripts could see is left behind
+SCROLL_FOLLOWERS_JS = '''
+async ({idleMs, burstMs, startIndex, limit}) => {
+    // Find the modal dialog
+    const modal = document.querySelector('[role="dialog"][data-e2e="follow-info-popup"]');
+    if (!modal) return {total: 0, rows: []};
+
+    // Find the scrollable container within the modal
+    // Try multiple selectors based on the HTML structure
+    const container =
+        modal.querySelector('[class*="DivUserListContainer"]') ||
+        modal.querySelector('[class*="UserListContainer"]') ||
+        modal.querySelector('div[class*="es9zqxz0"]') ||  // Specific class from HTML
+        modal.querySelector('div > ul') ||
+        modal;
+
+    // Live collection - its length stays current without re-querying
+    const items = modal.getElementsByTagName('li');
+    const start = performance.now();
+    let lastChange = start;
+    const observer = new MutationObserver(() => { lastChange = performance.now(); });
+    observer.observe(container, {childList: true, subtree: true});
+    try {
+        while (true) {
+            container.scrollTop = container.scrollHeight;
+            await new Promise(resolve => setTimeout(resolve, 100));
+            const now = performance.now();
+            if (now - lastChange > idleMs || now - start > burstMs) break;
+            // Stop as soon as MAX_FOLLOWERS_TO_REVIEW rows are in, not at the end of the burst
+            if (limit > 0 && items.length >= limit) break;
+        }
+    } finally {
+        observer.disconnect();
+    }
+
+    return (''' + EXTRACT_FOLLOWERS_JS.strip() + ''')(startIndex);
+}
+'''
+
+# Polled after an unfollow click with the clicked button and its label from before the click:
+# 'changed' once that same button reads something else (e.g. "Following" or "Friends" turning
+# into "Follow"), 'detached' if the row was re-rendered and the button is gone (nothing can be
+# concluded then), and '' (falsy, so wait_for_function keeps polling) while the label is unchanged
+BUTTON_LABEL_CHANGED_JS = '''
+([button, before]) => {
+    if (!button.isConnected) return 'detached';
+    return button.innerText.trim() !== before ? 'changed' : '';
+}
+'''
+
+
+def is_default_username(username):
+    """True for TikTok's auto-generated userXXXX names (only the prefix is lowercased)"""
+    return username[:4].lower() == 'user'
+
+
+def _preferred_first(selectors, preferred):
+    """Return selectors with the one that matched last time moved to the front"""
+    if preferred in selectors:
+        return (preferred,) + tuple(selector for selector in selectors if selector != preferred)
+    return selectors
+
+
+class RateLimiter:
+    """
+    Enforces a minimum interval between actions, counting time already spent since the last one.
+    With jitter, each interval is drawn from min_interval ± jitter * min_interval
+    """
+
+    def __init__(self, min_interval, jitter=0.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.interval = min_interval
+        # monotonic() has an arbitrary epoch (often boot time), so 0.0 could still be "recent" -
+        # -inf makes the first acquire() never wait
+        self.last = float('-inf')
+
+    def remaining(self):
+        """Seconds left before the next action may run"""
+        return max(0.0, self.interval - (time.monotonic() - self.last))
+
+    def acquire(self):
+        """Sleep only for whatever is left of the interval, then record the dispatch time"""
+        wait = self.remaining()
+        if wait > 0:
+            time.sleep(wait)
+        self.last = time.monotonic()
+        # Draw the next interval now so remaining() reports the same value until it is used
+        spread = self.min_interval * self.jitter
+        self.interval = self.min_interval + random.uniform(-spread, spread)
 
 
 class TikTokUnfollower:
     def __init__(self):
         self.state = self.load_state()
+        if self.migrate_unfollowed_history():
+            self.save_state()
+        # Set mirror of state['processed_accounts'] for O(1) membership checks
+        # (the list is kept because it is what gets serialized to state.json)
+        self.processed_set = set(self.state['processed_accounts'])
+        self.unsaved_changes = 0
         self.playwright = None
         self.browser = None
+        self.owns_browser = True
         self.context = None
         self.page = None
+        # Whether setup_browser() launches headless - login() turns it off to log in by hand
+        self.headless = HEADLESS
+        # Locator for the follow-info modal on self.page, set up with the page
+        self.following_modal = None
+        self.session_restored = False
+        # Follower rows harvested while scrolling the modal: {index, username, href}
+        self.loaded_followers = []
+        # Spaces unfollow clicks ACTION_DELAY apart, minus time spent locating and confirming rows
+        self.unfollow_limiter = RateLimiter(ACTION_DELAY)
+        # Spaces profile visits PROFILE_CHECK_DELAY (±25% so the rhythm looks human) apart,
+        # start to start - the time a check takes counts toward the gap
+        self.profile_limiter = RateLimiter(PROFILE_CHECK_DELAY, jitter=0.25)
+        # HTTP 429 cooldown set by _on_response(): current backoff (seconds) and monotonic end time
+        self.rate_limit_backoff = 0
+        self.cooldown_until = 0.0
+        # Selectors that matched last time, tried first on later checks (None until one matches)
+        self.messages_selector = None
+        self.following_tab_selector = None
 
     def load_state(self):
         """Load the state from file to track progress"""
-        if os.path.exists(STATE_FILE):
+        try:
+            with open(STATE_FILE, 'rb') as f:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError, so recovery below still applies
+                state = orjson.loads(f.read()) if orjson else json.load(f)
+                # Validate state structure
+                if not isinstance(state, dict):
+                    raise ValueError("State file is not a valid dictionary")
+                # Ensure required keys exist
+                state.setdefault('last_run', None)
+                state.setdefault('processed_accounts', [])
+                if not isinstance(state['processed_accounts'], list):
+                    raise ValueError("processed_accounts is not a list")
+                state['processed_accounts'] = state['processed_accounts'][-PROCESSED_ACCOUNTS_LIMIT:]
+                state.setdefault('unfollowed_total', 0)
+                state.setdefault('profile_verdicts', {})
+                state.setdefault('unfollow_failures', {})
+                for key in ('profile_verdicts', 'unfollow_failures'):
+                    if not isinstance(state[key], dict):
+                        raise ValueError(f"{key} is not a dictionary")
+                self._repair_state(state)
+                return state
+        except FileNotFoundError:
+            pass  # First run - start with the defaults below
+        except (json.JSONDecodeError, ValueError, OSError) as e:
+            # OSError covers an unreadable state.json (permissions, a directory in its place)
+            logger.warning(f"Corrupted or unreadable state file ({e}). Starting fresh.")
+            # Backup corrupted file
+            backup_file = f'{STATE_FILE}.backup'
             try:
-                with open(STATE_FILE, 'r') as f:
-                    state = json.load(f)
-                    # Validate state structure
-                    if not isinstance(state, dict):
-                        raise ValueError("State file is not a valid dictionary")
-                    # Ensure required keys exist
-                    state.setdefault('last_run', None)
-                    state.setdefault('processed_accounts', [])
-                    state.setdefault('unfollowed_accounts', [])
-                    return state
-            except (json.JSONDecodeError, ValueError) as e:
-                logger.warning(f"Corrupted state file ({e}). Starting fresh.")
-                # Backup corrupted file
-                backup_file = f'{STATE_FILE}.backup'
-                try:
-                    os.rename(STATE_FILE, backup_file)
-                    logger.info(f"Old state backed up to {backup_file}")
-                except Exception:
-                    pass
+                os.rename(STATE_FILE, backup_file)
+                logger.info(f"Old state backed up to {backup_file}")
+            except Exception:
+                pass
 
         return {
             'last_run': None,
             'processed_accounts': [],
-            'unfollowed_accounts': []
+            'unfollowed_total': 0,
+            'profile_verdicts': {},
+            'unfollow_failures': {}
         }
 
+    def _repair_state(self, state):
+        """Reset or drop malformed values inside a loaded state dict, warning about each"""
+        # Epoch seconds, or an ISO-8601 string from older state files
+        last_run = state['last_run']
+        if isinstance(last_run, str):
+            try:
+                datetime.fromisoformat(last_run)
+                valid = True
+            except ValueError:
+                valid = False
+        else:
+            valid = last_run is None or (isinstance(last_run, (int, float)) and not isinstance(last_run, bool))
+        if not valid:
+            logger.warning(f"Invalid last_run in {STATE_FILE} ({state['last_run']!r}), resetting it")
+            state['last_run'] = None
+
+        total = state['unfollowed_total']
+        if isinstance(total, bool) or not isinstance(total, (int, float)) or total < 0:
+            logger.warning(f"Invalid unfollowed_total in {STATE_FILE} ({total!r}), resetting it to 0")
+            state['unfollowed_total'] = 0
+        else:
+            state['unfollowed_total'] = int(total)
+
+        # Usernames are kept in a set, so anything unhashable (or not a name) has to go
+        processed = state['processed_accounts']
+        state['processed_accounts'] = [name for name in processed if isinstance(name, str)]
+        dropped = len(processed) - len(state['processed_accounts'])
+
+        verdicts = state['profile_verdicts']
+        for username, entry in list(verdicts.items()):
+            if not (isinstance(entry, dict) and isinstance(entry.get('reason'), str)
+                    and isinstance(entry.get('checked_at'), (int, float))):
+                del verdicts[username]
+                dropped += 1
+
+        failures = state['unfollow_failures']
+        for username, count in list(failures.items()):
+            if isinstance(count, bool) or not isinstance(count, int):
+                del failures[username]
+                dropped += 1
+
+        if dropped:
+            logger.warning(f"Dropped {dropped} malformed entries from {STATE_FILE}")
+
+        history = state.get('unfollowed_accounts')
+        if history is not None and not isinstance(history, list):
+            logger.warning(f"Invalid unfollowed_accounts in {STATE_FILE}, discarding it")
+            del state['unfollowed_accounts']
+
+    def migrate_unfollowed_history(self):
+        """
+        Move an unfollowed_accounts list from an older state.json into the JSONL audit log.
+        Returns True if state changed and should be saved
+        """
+        state = self.state
+        history = state.pop('unfollowed_accounts', None)
+        if history is None:
+            return False
+        if not history:
+            return True
+        state['unfollowed_total'] = max(state['unfollowed_total'], len(history))
+        try:
+            with open(UNFOLLOWED_LOG_FILE, 'a', encoding='utf-8') as f:
+                for entry in history:
+                    f.write(json.dumps(entry) + '\n')
+            logger.info(f"📝 Moved {len(history)} unfollow records to {UNFOLLOWED_LOG_FILE}")
+            return True
+        except (IOError, OSError) as e:
+            logger.warning(f"Could not write {UNFOLLOWED_LOG_FILE}, keeping history in state: {e}")
+            state['unfollowed_accounts'] = history
+            return False
+
     def save_state(self):
         """Save the current state to file"""
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            # Write to a temp file and swap it in, so a crash mid-write never truncates state.json
+            temp_file = f'{STATE_FILE}.tmp'
+            # Serialize in one shot - orjson if installed, otherwise json.dumps (which uses the C encoder,
+            # unlike json.dump); compact form as the file is rewritten often and only read by load_state()
+            if orjson:
+                payload = orjson.dumps(self.state)
+            else:
+                payload = json.dumps(self.state, separators=(',', ':')).encode('utf-8')
+            fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                # Make sure the data is on disk before the rename makes it visible
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(temp_file, STATE_FILE)
+            self.unsaved_changes = 0
         except (IOError, OSError) as e:
             logger.warning(f"Could not save state to {STATE_FILE}: {e}")
             # Don't raise - allow script to continue even if state save fails
 
-    def should_run(self):
-        """Check if enough time has passed since last run"""
+    def mark_processed(self, username):
+        """Record an account as processed in both the state list and the lookup set"""
+        if username not in self.processed_set:
+            processed = self.state['processed_accounts']
+            self.processed_set.add(username)
+            processed.append(username)
+            if len(processed) > PROCESSED_ACCOUNTS_LIMIT:
+                evicted = processed[:-PROCESSED_ACCOUNTS_LIMIT]
+                del processed[:-PROCESSED_ACCOUNTS_LIMIT]
+                self.processed_set.difference_update(evicted)
+            # Processed accounts are never checked again, so their verdict is no longer needed
+            self.state['profile_verdicts'].pop(username, None)
+            self.state['unfollow_failures'].pop(username, None)
+
+    def record_unfollow_failure(self, username):
+        """
+        Count a run that failed to unfollow an account, marking it processed once it has
+        failed UNFOLLOW_ATTEMPT_LIMIT times so it stops taking up a slot in every batch
+        """
+        failures = self.state['unfollow_failures']
+        failures[username] = failures.get(username, 0) + 1
+        if failures[username] >= UNFOLLOW_ATTEMPT_LIMIT:
+            logger.info(f"   ⏭️  Giving up on {username} after {UNFOLLOW_ATTEMPT_LIMIT} attempts - "
+                        f"unfollow it manually (it is listed in {CSV_EXPORT_FILE})")
+            self.mark_processed(username)
+        self.checkpoint_state()
+
+    def cached_verdict(self, username):
+        """Return the reason from an invalid verdict younger than PROFILE_VERDICT_TTL, or None"""
+        entry = self.state['profile_verdicts'].get(username)
+        if entry and time.time() - entry['checked_at'] < PROFILE_VERDICT_TTL:
+            return entry['reason']
+        return None
+
+    def remember_verdict(self, username, reason):
+        """Cache an invalid verdict, evicting the oldest past PROFILE_VERDICT_LIMIT"""
+        verdicts = self.state['profile_verdicts']
+        # Re-insert so dict order stays oldest-first
+        verdicts.pop(username, None)
+        verdicts[username] = {'reason': reason, 'checked_at': time.time()}
+        while len(verdicts) > PROFILE_VERDICT_LIMIT:
+            del verdicts[next(iter(verdicts))]
+
+    def record_unfollow(self, username):
+        """Append the unfollow to the JSONL audit log and bump the running total"""
+        try:
+            with open(UNFOLLOWED_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'username': username,
+                    'timestamp': datetime.now().isoformat()
+                }) + '\n')
+        except (IOError, OSError) as e:
+            logger.warning(f"Could not append to {UNFOLLOWED_LOG_FILE}: {e}")
+        self.state['unfollowed_total'] += 1
+
+    def checkpoint_state(self):
+        """Record a state change and save every STATE_SAVE_INTERVAL changes"""
+        self.unsaved_changes += 1
+        if self.unsaved_changes >= STATE_SAVE_INTERVAL:
+            self.save_state()
+
+    def seconds_until_next_run(self):
+        """Seconds left until UNFOLLOW_DELAY has passed since the last run (0 or less = due)"""
         if not self.state['last_run']:
-            return True
+            return 0
+
+        last_run = self.state['last_run']
+        if isinstance(last_run, str):
+            # State files written before last_run became epoch seconds store an ISO-8601 string
+            last_run = datetime.fromisoformat(last_run).timestamp()
 
-        last_run = datetime.fromisoformat(self.state['last_run'])
-        next_run = last_run + timedelta(seconds=UNFOLLOW_DELAY)
+        return last_run + UNFOLLOW_DELAY - time.time()
 
-        if datetime.now() < next_run:
-            wait_time = (next_run - datetime.now()).total_seconds()
+    def should_run(self):
+        """Check if enough time has passed since last run"""
+        wait_time = self.seconds_until_next_run()
+        if wait_time > 0:
             logger.info(f"⏰ Too soon to run again. Wait {wait_time/3600:.2f} hours")
             return False
 
         return True
 
-    def export_to_csv(self, invalid_accounts):
-        """Export invalid accounts to CSV file"""
+    def export_to_csv(self, account):
+        """Append one invalid account to the CSV file, returning True if it was written"""
         try:
-            # Check if file exists to determine if we need to write headers
-            file_exists = os.path.exists(CSV_EXPORT_FILE)
-
             with open(CSV_EXPORT_FILE, 'a', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
 
-                # Write header if file is new
-                if not file_exists:
+                # Write header if file is new - append mode opens at the end, so position 0 means empty
+                if f.tell() == 0:
                     writer.writerow(['Timestamp', 'Username', 'Detection Reason'])
 
-                # Write account data
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                for account in invalid_accounts:
-                    writer.writerow([
-                        timestamp,
-                        account.get('username', 'Unknown'),
-                        account.get('reason', 'Invalid account detected')
-                    ])
-
-            logger.info(f"📄 Exported {len(invalid_accounts)} invalid accounts to {CSV_EXPORT_FILE}")
+                writer.writerow([
+                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    account['username'],
+                    account['reason']
+                ])
+            return True
         except Exception as e:
             logger.warning(f"Could not export to CSV: {e}")
+            return False
 
     def load_session(self):
         """Load saved browser session if available"""
@@ -225,9 +767,15 @@ class TikTokUnfollower:
 
     def save_session_state(self):
         """Save browser session for future runs"""
+        # A persistent profile is written by the browser itself, and an attached CDP browser's
+        # default context holds cookies for every site in the user's profile - never dump those
+        if BROWSER_PROFILE_DIR or BROWSER_CDP_URL:
+            return
         if SAVE_SESSION and self.context:
             try:
                 self.context.storage_state(path=SESSION_FILE)
+                # Session file holds login cookies - keep it readable by the owner only
+                os.chmod(SESSION_FILE, 0o600)
                 logger.info(f"💾 Session saved to {SESSION_FILE}")
             except Exception as e:
                 logger.warning(f"Could not save session: {e}")
@@ -235,50 +783,221 @@ class TikTokUnfollower:
     def setup_browser(self):
         """Initialize Playwright and browser"""
         logger.info("🌐 Setting up browser...")
+        load_playwright()
         self.playwright = sync_playwright().start()
 
-        # Launch browser (Chrome-based for better compatibility)
-        self.browser = self.playwright.chromium.launch(
-            headless=HEADLESS,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-            ]
-        )
+        if BROWSER_CDP_URL:
+            self._connect_to_running_browser()
+            return
 
-        # Check if we have a saved session
-        session_path = self.load_session()
+        # CHROMIUM_ARGS are Blink switches - other engines launch with their defaults
+        launch_options = {'headless': self.headless}
+        if BROWSER == 'chromium':
+            # Launch browser (Chrome-based for better compatibility)
+            launch_args = list(CHROMIUM_ARGS)
+            if BLOCK_RESOURCES:
+                # Skip image decoding entirely, on top of the request filter below
+                launch_args.append('--blink-settings=imagesEnabled=false')
+            launch_options['args'] = launch_args
 
         # Create context with realistic settings and optional session restore
         context_options = {
-            'viewport': {'width': 1920, 'height': 1080},
-            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            # Smaller viewport and no HiDPI scaling = fewer pixels to lay out and paint per scroll
+            'viewport': {'width': 1280, 'height': 720},
+            'device_scale_factor': 1,
         }
 
+        # A Chrome user agent on another engine would stand out, so only Chromium gets one
+        if BROWSER == 'chromium':
+            context_options['user_agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+        browser_type = getattr(self.playwright, BROWSER)
+
+        if BROWSER_PROFILE_DIR:
+            self._launch_persistent_context(browser_type, launch_options, context_options)
+            return
+
+        self.browser = browser_type.launch(**launch_options)
+        if BROWSER != 'chromium':
+            logger.info(f"✓ Launched {BROWSER}")
+
+        # Check if we have a saved session
+        session_path = self.load_session()
         if session_path:
             context_options['storage_state'] = session_path
+            self.session_restored = True
             logger.info("✓ Loaded saved session (may skip login)")
 
         self.context = self.browser.new_context(**context_options)
+        self._prepare_context()
+
+    def _launch_persistent_context(self, browser_type, launch_options, context_options):
+        """Launch the browser on BROWSER_PROFILE_DIR so it keeps its own login state on disk"""
+        self.session_restored = profile_has_session(BROWSER_PROFILE_DIR)
+
+        # A persistent context has no separate Browser object - cleanup() closes the context
+        self.context = browser_type.launch_persistent_context(
+            BROWSER_PROFILE_DIR, **launch_options, **context_options
+        )
+        if self.session_restored:
+            logger.info(f"✓ Using browser profile {BROWSER_PROFILE_DIR} (may skip login)")
+        else:
+            logger.info(f"✓ Created browser profile {BROWSER_PROFILE_DIR}")
+
+        # The profile opens with a blank tab - use it rather than opening a second one
+        self._prepare_context(reuse_page=True)
+
+    def _connect_to_running_browser(self):
+        """Attach to an already running Chromium over CDP instead of launching one"""
+        logger.info(f"🔌 Connecting to running browser at {BROWSER_CDP_URL}...")
+        self.browser = self.playwright.chromium.connect_over_cdp(BROWSER_CDP_URL)
+        self.owns_browser = False
+
+        # Reuse the browser's default context so its profile cookies are used
+        if self.browser.contexts:
+            self.context = self.browser.contexts[0]
+            self.session_restored = True
+            logger.info("✓ Using existing browser profile (may skip login)")
+        else:
+            self.context = self.browser.new_context()
 
-        self.page = self.context.new_page()
+        self._prepare_context()
+
+    def _prepare_context(self, reuse_page=False):
+        """Install request filtering and init scripts, then open the working page"""
+        # Single route handler for all requests - keep it cheap since it runs per request
+        if BLOCK_RESOURCES:
+            self.context.route('**/*', self._filter_request)
+            logger.info("✓ Blocking images, media, fonts and analytics requests")
+
+        # Disable CSS animations/transitions so newly loaded rows settle immediately
+        self.context.add_init_script(DISABLE_ANIMATIONS_SCRIPT)
+
+        # Watch for HTTP 429s so profile checks and unfollows pause while TikTok rate limits
+        self.context.on('response', self._on_response)
+
+        if reuse_page and self.context.pages:
+            self.page = self.context.pages[0]
+        else:
+            self.page = self.context.new_page()
+        # Built once per page - a Locator re-resolves on every use, so it never goes stale
+        self.following_modal = self.page.locator(FOLLOWING_MODAL_SELECTOR)
         logger.info("✓ Browser ready")
 
+    def _on_response(self, response):
+        """Start a cooldown when TikTok answers with HTTP 429, doubling it on each new episode"""
+        if response.status != 429:
+            return
+
+        # A throttled page fires many 429s at once - count them as one episode
+        now = time.monotonic()
+        if now < self.cooldown_until:
+            return
+
+        self.rate_limit_backoff = min(THROTTLE_BACKOFF_CAP, max(ACTION_DELAY, self.rate_limit_backoff * 2, 1))
+        self.cooldown_until = now + self.rate_limit_backoff
+
+    def _wait_out_rate_limit(self):
+        """Sleep until a cooldown started by _on_response() is over"""
+        wait = self.cooldown_until - time.monotonic()
+        if wait > 0:
+            logger.info(f"   ⏳ TikTok returned HTTP 429 - cooling down for {wait:.0f} seconds...")
+            time.sleep(wait)
+        else:
+            # No 429 since the last action - let the backoff decay so a later episode starts lower
+            self.rate_limit_backoff //= 2
+
+    def _filter_request(self, route, request):
+        """Abort requests the script never uses, let everything else through"""
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        elif any(pattern in request.url for pattern in BLOCKED_URL_PATTERNS):
+            route.abort()
+        else:
+            route.continue_()
+
     def login(self):
         """Login to TikTok account"""
         logger.info(f"🔐 Logging in to TikTok (method: {LOGIN_METHOD})...")
 
+        # A restored session is usually still valid - skip the login flow (and 2FA) entirely
+        if self.session_restored and self._is_logged_in_from_session():
+            logger.info("✓ Already logged in from saved session!")
+            return
+
+        self._run_login_flow()
+
+    def _run_login_flow(self):
+        """Log in with LOGIN_METHOD, opening a browser window first if a step must be done by hand"""
         if LOGIN_METHOD == 'google':
+            # Google sign-in is always completed by hand in the browser window
+            self._open_visible_browser()
             self._login_with_google()
-        else:
+        elif not self._login_with_email():
+            # The automated login stopped at a step done by hand (2FA, captcha) - redo it with a window
+            self._open_visible_browser()
             self._login_with_email()
 
+    def _needs_window(self):
+        """True if a login step done by hand can't be shown (HEADLESS doesn't apply over CDP)"""
+        return self.headless and not BROWSER_CDP_URL
+
+    def _open_visible_browser(self):
+        """
+        Make sure the browser has a window before a login step done by hand: reopen it headed when
+        the HEADLESS default chose headless, raise when HEADLESS=true was set explicitly
+        """
+        if not self._needs_window():
+            return
+        if not HEADLESS_DEFAULTED:
+            raise ValueError("Logging in needs a step done by hand (2FA, captcha or Google sign-in) "
+                             "and HEADLESS=true - set HEADLESS=false in .env and run again to log in "
+                             "with a visible browser")
+        logger.info("   Login needs a step done by hand - reopening the browser with a window...")
+        self.cleanup()
+        self.headless = False
+        self.setup_browser()
+
+    def _is_logged_in_from_session(self):
+        """Open the home page and check whether the restored (or daemon's) session is logged in"""
+        logger.info("   Checking if already logged in from saved session...")
+        try:
+            self.page.goto('https://www.tiktok.com/')
+        except Exception as e:
+            logger.warning(f"   Could not open TikTok home page: {e}")
+            return False
+
+        if self._wait_for_messages_menu(timeout=5000):
+            return True
+
+        logger.info("   Saved session is not logged in, continuing with login...")
+        return False
+
+    def _wait_for_messages_menu(self, timeout):
+        """Wait for the Messages sidebar item, which only appears when logged in"""
+        # Try the selector that matched last time first, so later checks skip the fallbacks
+        for selector in _preferred_first(MESSAGES_SELECTORS, self.messages_selector):
+            try:
+                self.page.wait_for_selector(selector, timeout=timeout)
+                self.messages_selector = selector
+                return True
+            except PlaywrightTimeoutError:
+                continue
+        return False
+
     def _login_with_email(self):
-        """Login using email/username and password"""
+        """
+        Login using email/username and password. Returns False, without waiting for input,
+        if a headless browser reaches a step that has to be done by hand
+        """
         # Navigate to TikTok email login page
         self.page.goto('https://www.tiktok.com/login/phone-or-email/email')
 
-        # Wait a bit for page to load
-        time.sleep(3)
+        # Wait for the login form instead of a fixed delay
+        try:
+            self.page.wait_for_selector('input[type="password"], input[name="username"]', timeout=15000)
+        except PlaywrightTimeoutError:
+            logger.info("   Login form did not appear within 15 seconds, trying anyway...")
 
         try:
             # Try to find and fill login form
@@ -290,13 +1009,12 @@ class TikTokUnfollower:
                 # Alternative selector
                 username_input = self.page.locator('input[type="text"]').first
 
+            # fill() waits for each input to be editable, so no pause is needed between them
             username_input.fill(TIKTOK_USERNAME)
-            time.sleep(1)
 
             # Look for password input
             password_input = self.page.locator('input[type="password"]').first
             password_input.fill(TIKTOK_PASSWORD)
-            time.sleep(1)
 
             # Click login button
             login_button = self.page.locator('button[type="submit"]').first
@@ -311,76 +1029,48 @@ class TikTokUnfollower:
             logger.info("   (If 2FA is enabled, please complete it in the browser)")
             logger.info("   (Checking for Messages in sidebar as login indicator)")
 
-            # Wait for either successful login or stay on page for manual intervention
-            time.sleep(5)
-
             # Check if we're logged in by looking for Messages in the left sidebar
             # Messages menu item only appears when logged in
             try:
-                # Try multiple selectors for the Messages menu item
-                messages_selectors = [
-                    'text=Messages',  # Text content
-                    '[href*="/messages"]',  # Link to messages
-                    'a:has-text("Messages")',  # Link containing Messages text
-                ]
-
-                logged_in = False
-                for selector in messages_selectors:
-                    try:
-                        self.page.wait_for_selector(selector, timeout=25000)
-                        logged_in = True
-                        break
-                    except PlaywrightTimeoutError:
-                        continue
-
-                if logged_in:
+                if self._wait_for_messages_menu(timeout=25000):
                     logger.info("✓ Login successful! (Messages menu detected)")
+                    return True
                 else:
                     raise PlaywrightTimeoutError("Messages menu not found")
 
             except PlaywrightTimeoutError:
-                logger.info("⚠️  Please complete login manually if needed (2FA, captcha, etc.)")
+                if self._needs_window():
+                    logger.warning("⚠️  Login did not complete automatically (2FA, captcha, etc.)")
+                    return False
+                logger.warning("⚠️  Please complete login manually if needed (2FA, captcha, etc.)")
                 logger.info("   Press Enter when logged in (check if Messages appears in sidebar)...")
                 input()
 
         except Exception as e:
-            logger.info(f"⚠️  Login form interaction failed: {e}")
+            logger.warning(f"⚠️  Login form interaction failed: {e}")
+            if self._needs_window():
+                return False
             logger.info("   Please log in manually in the browser window")
             logger.info("   Press Enter when logged in...")
             input()
 
+        return True
+
     def _login_with_google(self):
         """Login using Google OAuth"""
         # Navigate to TikTok main login page
         self.page.goto('https://www.tiktok.com/login')
 
-        # Wait a bit for page to load
-        time.sleep(3)
-
-        # First, check if we're already logged in from a saved session
-        logger.info("   Checking if already logged in from saved session...")
+        # Wait until the login options (or the Messages sidebar, if already logged in) render
         try:
-            # Check for Messages menu (indicates logged in)
-            messages_selectors = [
-                'text=Messages',
-                '[href*="/messages"]',
-                'a:has-text("Messages")',
-            ]
-
-            already_logged_in = False
-            for selector in messages_selectors:
-                try:
-                    self.page.wait_for_selector(selector, timeout=5000)
-                    already_logged_in = True
-                    break
-                except PlaywrightTimeoutError:
-                    continue
+            self.page.get_by_text('Continue with Google', exact=False).or_(
+                self.page.locator('[href*="/messages"]')
+            ).first.wait_for(timeout=10000)
+        except PlaywrightTimeoutError:
+            logger.info("   Login page did not finish rendering within 10 seconds, continuing...")
 
-            if already_logged_in:
-                logger.info("✓ Already logged in from saved session!")
-                return
-        except Exception:
-            pass
+        # login() (or the daemon loop) has already checked a restored session for the Messages
+        # menu before getting here, so don't poll for it again
 
         try:
             # Look for "Continue with Google" button
@@ -417,28 +1107,12 @@ class TikTokUnfollower:
                     pass
 
             # If no Google button found, might already be logged in
-            if not google_button or google_button.count() == 0:
+            if not google_button:
                 logger.info("   Google login button not found - checking if already logged in...")
-                time.sleep(5)
 
                 # Check for Messages menu again
                 try:
-                    messages_selectors = [
-                        'text=Messages',
-                        '[href*="/messages"]',
-                        'a:has-text("Messages")',
-                    ]
-
-                    already_logged_in = False
-                    for selector in messages_selectors:
-                        try:
-                            self.page.wait_for_selector(selector, timeout=5000)
-                            already_logged_in = True
-                            break
-                        except PlaywrightTimeoutError:
-                            continue
-
-                    if already_logged_in:
+                    if self._wait_for_messages_menu(timeout=5000):
                         logger.info("✓ Already logged in from previous session!")
                         return
                     else:
@@ -446,10 +1120,9 @@ class TikTokUnfollower:
                 except Exception as e:
                     raise Exception(f"Could not find 'Continue with Google' button: {e}")
 
-            if google_button and google_button.count() > 0:
+            if google_button:
                 logger.info("   Found Google login button, clicking...")
                 google_button.click()
-                time.sleep(3)
 
                 # Now we should be on Google's OAuth page
                 logger.info("   Please complete Google sign-in in the browser...")
@@ -466,29 +1139,13 @@ class TikTokUnfollower:
                 # Check if we're logged in by looking for Messages in the left sidebar
                 # Messages menu item only appears when logged in
                 try:
-                    # Try multiple selectors for the Messages menu item
-                    messages_selectors = [
-                        'text=Messages',  # Text content
-                        '[href*="/messages"]',  # Link to messages
-                        'a:has-text("Messages")',  # Link containing Messages text
-                    ]
-
-                    logged_in = False
-                    for selector in messages_selectors:
-                        try:
-                            self.page.wait_for_selector(selector, timeout=30000)
-                            logged_in = True
-                            break
-                        except PlaywrightTimeoutError:
-                            continue
-
-                    if logged_in:
+                    if self._wait_for_messages_menu(timeout=30000):
                         logger.info("✓ Login successful! (Messages menu detected)")
                     else:
                         raise PlaywrightTimeoutError("Messages menu not found")
 
                 except PlaywrightTimeoutError:
-                    logger.info("⚠️  OAuth flow taking longer than expected")
+                    logger.warning("⚠️  OAuth flow taking longer than expected")
                     logger.info("   Press Enter when logged in (check if Messages appears in sidebar)...")
                     input()
 
@@ -496,7 +1153,7 @@ class TikTokUnfollower:
                 raise Exception("Could not find 'Continue with Google' button")
 
         except Exception as e:
-            logger.info(f"⚠️  Google login failed: {e}")
+            logger.warning(f"⚠️  Google login failed: {e}")
             logger.info("   Please complete login manually in the browser window")
             logger.info("   Steps:")
             logger.info("   1. Click 'Continue with Google'")
@@ -546,10 +1203,13 @@ class TikTokUnfollower:
                     except Exception:
                         pass
 
-                if profile_button and profile_button.count() > 0:
+                if profile_button:
                     logger.info("   Found Profile button, clicking...")
                     profile_button.click()
-                    time.sleep(3)
+                    try:
+                        self.page.wait_for_url('**/@*', timeout=15000)
+                    except PlaywrightTimeoutError:
+                        logger.info("   Profile page URL did not load within 15 seconds, continuing...")
 
                     # Get the profile URL for logging
                     current_url = self.page.url
@@ -574,7 +1234,6 @@ class TikTokUnfollower:
                     logger.info("   Found Following button via data-e2e attribute, clicking...")
                     following_element.click()
                     modal_opened = True
-                    time.sleep(2)
             except Exception as e:
                 logger.info(f"   Could not click via data-e2e selector: {e}")
 
@@ -586,19 +1245,12 @@ class TikTokUnfollower:
                         logger.info("   Found Following button via text search, clicking...")
                         following_element.click()
                         modal_opened = True
-                        time.sleep(2)
                 except Exception as e:
                     logger.info(f"   Could not click via text search: {e}")
 
             # Additional fallback selectors
             if not modal_opened:
-                following_selectors = [
-                    '[data-e2e="following-count"]',
-                    'strong[title="Following"]',
-                    '//strong[@title="Following"]/..',
-                ]
-
-                for selector in following_selectors:
+                for selector in FOLLOWING_BUTTON_SELECTORS:
                     try:
                         if selector.startswith('//'):
                             element = self.page.locator(f'xpath={selector}').first
@@ -609,7 +1261,6 @@ class TikTokUnfollower:
                             logger.info(f"   Found Following button via fallback selector, clicking...")
                             element.click()
                             modal_opened = True
-                            time.sleep(2)
                             break
                     except Exception as e:
                         continue
@@ -617,55 +1268,52 @@ class TikTokUnfollower:
             if not modal_opened:
                 raise Exception("Could not find Following button with any selector")
 
-            # Wait for the modal to appear
+            # Wait for the modal to appear (this replaces fixed sleeps after the clicks above)
             logger.info("   Waiting for modal to open...")
             try:
-                modal = self.page.locator('[role="dialog"][data-e2e="follow-info-popup"]')
+                modal = self.following_modal
                 modal.wait_for(state='visible', timeout=10000)
                 logger.info("✓ Following modal opened successfully!")
 
                 # Click on the "Following" tab within the modal to show the following list
                 # The modal has tabs: Following, Followers, Friends, Suggested
                 logger.info("   Clicking 'Following' tab in modal...")
-                time.sleep(1)
 
                 # Try to find and click the Following tab
                 following_tab_clicked = False
                 try:
-                    # Look for the tab containing "Following" text within the modal
-                    # The tab structure has div with text "Following" and strong with count
-                    following_tab_selectors = [
-                        # Look for div containing both "Following" text and a count
-                        '//div[contains(@class, "DivTabItem") and .//div[text()="Following"]]',
-                        # Alternative: look for any clickable element with "Following" in the tabs area
-                        '//div[contains(@class, "DivTabs")]//div[text()="Following"]/..',
-                    ]
-
-                    for selector in following_tab_selectors:
+                    # Look for the tab containing "Following" text within the modal,
+                    # starting with the selector that worked on the previous visit
+                    for selector in _preferred_first(FOLLOWING_TAB_SELECTORS, self.following_tab_selector):
                         try:
                             tab = modal.locator(f'xpath={selector}').first
                             if tab.count() > 0:
                                 tab.click()
                                 following_tab_clicked = True
-                                time.sleep(1)
+                                self.following_tab_selector = selector
+                                # Wait for the first row of the list instead of a fixed delay
+                                try:
+                                    modal.locator('li').first.wait_for(state='attached', timeout=5000)
+                                except PlaywrightTimeoutError:
+                                    pass
                                 logger.info("   ✓ Clicked on Following tab")
                                 break
                         except Exception:
                             continue
 
                     if not following_tab_clicked:
-                        logger.info("   ⚠️  Could not auto-click Following tab, may already be selected")
+                        logger.warning("   ⚠️  Could not auto-click Following tab, may already be selected")
 
                 except Exception as e:
-                    logger.info(f"   ⚠️  Error clicking Following tab: {e}")
+                    logger.warning(f"   ⚠️  Error clicking Following tab: {e}")
                     logger.info("   Continuing anyway - tab may already be selected")
 
             except PlaywrightTimeoutError:
-                logger.info("⚠️  Modal did not appear as expected")
+                logger.warning("⚠️  Modal did not appear as expected")
                 raise ValueError("Following modal did not open")
 
         except Exception as e:
-            logger.info(f"⚠️  Could not open following modal: {e}")
+            logger.warning(f"⚠️  Could not open following modal: {e}")
             logger.info("   Please open the following modal manually:")
             logger.info("   1. Make sure you're on your profile")
             logger.info("   2. Click on your 'Following' count number")
@@ -677,15 +1325,15 @@ class TikTokUnfollower:
     def validate_on_following_page(self):
         """Validate that the following modal is open"""
         try:
-            # Check if the modal dialog is visible
-            modal = self.page.locator('[role="dialog"][data-e2e="follow-info-popup"]')
-            if modal.count() > 0 and modal.is_visible():
+            # Check if the modal dialog is visible - is_visible() is False when it doesn't exist
+            modal = self.following_modal
+            if modal.is_visible():
                 return True
             else:
-                logger.info(f"⚠️  Warning: Following modal is not visible")
+                logger.warning(f"⚠️  Warning: Following modal is not visible")
                 return False
         except Exception as e:
-            logger.info(f"⚠️  Error checking for modal: {e}")
+            logger.warning(f"⚠️  Error checking for modal: {e}")
             return False
 
     def scroll_and_load_followers(self):
@@ -704,70 +1352,65 @@ class TikTokUnfollower:
             except KeyboardInterrupt:
                 raise
 
+        self.loaded_followers = []
         previous_count = 0
         no_change_count = 0
         max_attempts = 10  # Maximum scroll attempts if nothing loads
+        max_no_change = 6
+        # Rows stream in fast while loading, so start with a short quiet period and back off when stalled
+        scroll_wait_ms = SCROLL_WAIT_MIN_MS
+        deadline = time.monotonic() + SCROLL_TIME_LIMIT
 
         while True:
-            # Scroll within the modal's user list container
-            # The modal contains a scrollable div with the user list
-            self.page.evaluate('''
-                () => {
-                    // Find the modal dialog
-                    const modal = document.querySelector('[role="dialog"][data-e2e="follow-info-popup"]');
-                    if (!modal) return;
-
-                    // Find the scrollable container within the modal
-                    // Try multiple selectors based on the HTML structure
-                    const scrollContainer =
-                        modal.querySelector('[class*="DivUserListContainer"]') ||
-                        modal.querySelector('[class*="UserListContainer"]') ||
-                        modal.querySelector('div[class*="es9zqxz0"]') ||  // Specific class from HTML
-                        modal.querySelector('div > ul') ||
-                        modal;
-
-                    if (scrollContainer) {
-                        scrollContainer.scrollTop = scrollContainer.scrollHeight;
-                    }
-                }
-            ''')
-
-            time.sleep(2)
-
-            # Count current followers loaded (look within the modal)
-            # User items are <li> elements containing user info
-            modal = self.page.locator('[role="dialog"][data-e2e="follow-info-popup"]')
-            followers = modal.locator('li').count()
-
-            # Alternative: try to count by user container class
-            if followers == 0:
-                followers = modal.locator('[class*="DivUserContainer"]').count()
+            # Scroll within the modal's user list container until the list goes quiet (or the
+            # burst time is up), then harvest the rows that appeared - all in one evaluate call
+            # User items are <li> elements containing user info (DivUserContainer as a fallback count)
+            try:
+                result = self.page.evaluate(SCROLL_FOLLOWERS_JS, {
+                    'idleMs': scroll_wait_ms,
+                    'burstMs': SCROLL_BURST_MS,
+                    'startIndex': len(self.loaded_followers),
+                    'limit': MAX_FOLLOWERS_TO_REVIEW
+                })
+            except Exception as e:
+                logger.warning(f"   Could not scroll or read followers from modal: {e}")
+                result = {'total': previous_count, 'rows': []}
+            self.loaded_followers.extend(result['rows'])
+            followers = result['total']
 
             logger.info(f"   Loaded {followers} accounts...")
 
             # Check if we've reached the user-defined limit
             if MAX_FOLLOWERS_TO_REVIEW > 0 and followers >= MAX_FOLLOWERS_TO_REVIEW:
                 logger.info(f"✓ Reached review limit. Total: {followers} accounts")
+                # Rows past the limit may have arrived in the same burst - review only the limit
+                del self.loaded_followers[MAX_FOLLOWERS_TO_REVIEW:]
                 break
 
             if followers == previous_count:
                 no_change_count += 1
-                if no_change_count >= 3:
+                if no_change_count >= max_no_change:
                     logger.info(f"✓ Finished loading. Total: {followers} accounts")
                     break
+                scroll_wait_ms = min(int(scroll_wait_ms * 1.5), SCROLL_WAIT_MAX_MS)
             else:
                 no_change_count = 0
+                scroll_wait_ms = SCROLL_WAIT_MIN_MS
+
+            if time.monotonic() > deadline:
+                logger.warning(f"⚠️  Still loading after {SCROLL_TIME_LIMIT // 60} minutes. Stopping scroll at {followers} accounts.")
+                break
 
             previous_count = followers
 
             # Safety check - if we've loaded a very large number, break
             if followers > 15000:
-                logger.info("⚠️  Loaded over 15,000 accounts. Stopping scroll.")
+                logger.warning("⚠️  Loaded over 15,000 accounts. Stopping scroll.")
                 break
 
             # Safety check - if nothing loads after multiple attempts
             if followers == 0 and no_change_count >= max_attempts:
-                logger.info("⚠️  No followers found after multiple attempts.")
+                logger.warning("⚠️  No followers found after multiple attempts.")
                 logger.info("   Please verify the Following modal is open and you have followers.")
                 break
 
@@ -780,7 +1423,7 @@ class TikTokUnfollower:
         """
         try:
             # Quick check: Auto-remove accounts with "user" prefix (default TikTok usernames)
-            if username.lower().startswith('user'):
+            if is_default_username(username):
                 logger.info(f"      ❌ Auto-flagged: Username starts with 'user' (default/spam account)")
                 return True, "Default username format (userXXXX)"
 
@@ -789,190 +1432,197 @@ class TikTokUnfollower:
             logger.info(f"      Checking profile: {profile_url}")
 
             self.page.goto(profile_url, timeout=30000)
-            time.sleep(3)
+            self._wait_for_profile_content()
+
+            # One round trip for the Refresh check, page text and video count
+            profile = self.page.evaluate(PROFILE_SNAPSHOT_JS)
 
             # Secondary check: Look for Refresh button (indicates page load issue, not invalid account)
-            try:
-                refresh_button = self.page.get_by_text('Refresh', exact=False).first
-                if refresh_button.count() > 0:
-                    logger.info(f"      ⚠️  Found Refresh button - page may not have loaded properly")
+            if profile['hasRefresh']:
+                try:
+                    logger.warning(f"      ⚠️  Found Refresh button - page may not have loaded properly")
                     logger.info(f"      Clicking Refresh and retrying...")
-                    refresh_button.click()
-                    time.sleep(3)
-            except Exception:
-                pass
-
-            # Get page text after potential refresh
-            page_text = self.page.inner_text('body').lower()
+                    self.page.get_by_text('Refresh', exact=False).first.click()
+                    self._wait_for_profile_content(ignore_refresh=True)
+                except Exception:
+                    pass
 
-            # Check again for Refresh button after waiting - if still there, skip this account
-            try:
-                refresh_button = self.page.get_by_text('Refresh', exact=False).first
-                if refresh_button.count() > 0:
-                    logger.info(f"      ⚠️  Refresh button still present - skipping to avoid false positive")
+                # Check again for Refresh button after waiting - if still there, skip this account
+                profile = self.page.evaluate(PROFILE_SNAPSHOT_JS)
+                if profile['hasRefresh']:
+                    logger.warning(f"      ⚠️  Refresh button still present - skipping to avoid false positive")
                     return False, None  # Mark as valid to avoid false positive
-            except Exception:
-                pass
 
-            # Check for "Couldn't find this account" message
-            if "couldn't find this account" in page_text or "couldn't find this account" in page_text:
-                return True, "Account not found"
+            page_text = profile['text']
 
-            if "account not found" in page_text:
+            # Check for "Couldn't find this account" / "Account not found" messages
+            if NOT_FOUND_PROFILE_RE.search(page_text):
                 return True, "Account not found"
 
-            if "banned" in page_text and "account" in page_text:
+            if BANNED_PROFILE_RE.search(page_text) and ACCOUNT_WORD_RE.search(page_text):
                 return True, "Banned account"
 
             # Check for videos on the profile
-            # Look for video count or video elements
-            try:
-                # Try to find video count indicator
-                # TikTok shows video count on profile, look for common selectors
-                video_count_selectors = [
-                    '[data-e2e="user-post-item"]',  # Individual video items
-                    '[class*="DivItemContainer"]',  # Video container
-                    'div[data-e2e="user-post-item-list"] > div',  # Videos in the list
-                ]
-
-                has_videos = False
-                for selector in video_count_selectors:
-                    try:
-                        video_elements = self.page.locator(selector)
-                        count = video_elements.count()
-                        if count > 0:
-                            logger.info(f"      Found {count} videos")
-                            has_videos = True
-                            break
-                    except Exception:
-                        continue
-
-                if not has_videos:
-                    # Also check for "No content" or empty state messages
-                    if "no content" in page_text or "hasn't posted" in page_text:
-                        return True, "No videos (likely deleted/banned)"
-                    # If we can't find videos but also no error message, mark as invalid
-                    return True, "No videos found"
-
+            if profile['videoCount'] > 0:
                 # Account has videos, it's valid
+                logger.info(f"      Found {profile['videoCount']} videos")
                 return False, None
 
-            except Exception as e:
-                logger.info(f"      Error checking for videos: {e}")
-                # If we can't determine, assume valid to avoid false positives
-                return False, None
+            # Also check for "No content" or empty state messages
+            if EMPTY_PROFILE_RE.search(page_text):
+                return True, "No videos (likely deleted/banned)"
+            # If we can't find videos but also no error message, mark as invalid
+            return True, "No videos found"
 
         except Exception as e:
-            logger.info(f"      Error checking account {username}: {e}")
+            logger.warning(f"      Error checking account {username}: {e}")
             # On error, default to NOT invalid to avoid false positives
             return False, None
 
+    def _wait_for_profile_content(self, ignore_refresh=False):
+        """Wait until the profile page shows videos or one of the messages the checks look for"""
+        try:
+            self.page.wait_for_function(
+                PROFILE_READY_JS,
+                arg={'ignoreRefresh': ignore_refresh},
+                polling=PROFILE_READY_POLL_MS,
+                timeout=PROFILE_READY_TIMEOUT_MS
+            )
+        except PlaywrightTimeoutError:
+            # e.g. a profile with no videos and no message - the checks decide from what's there
+            pass
+
     def unfollow_invalid_accounts(self):
         """Find and unfollow banned/deleted accounts by checking their profiles"""
         logger.info("🔍 Scanning for banned/deleted accounts by checking profiles...")
 
-        # Get all follower elements from within the modal
-        modal = self.page.locator('[role="dialog"][data-e2e="follow-info-popup"]')
-
-        # Get follower list items within the modal
-        follower_elements = modal.locator('li').all()
+        # Rows were harvested while scrolling; read them in one round-trip if that didn't happen
+        follower_rows = self.loaded_followers
+        if not follower_rows:
+            try:
+                follower_rows = self.page.evaluate(EXTRACT_FOLLOWERS_JS, 0)['rows']
+            except Exception as e:
+                logger.warning(f"⚠️  Could not read followers from modal: {e}")
+                follower_rows = []
 
-        if len(follower_elements) == 0:
-            logger.info("⚠️  No followers loaded in modal. Cannot scan for invalid accounts.")
+        if len(follower_rows) == 0:
+            logger.warning("⚠️  No followers loaded in modal. Cannot scan for invalid accounts.")
             return 0
 
         # First, extract all usernames from the modal
-        logger.info(f"   Extracting usernames from {len(follower_elements)} accounts...")
+        logger.info(f"   Extracting usernames from {len(follower_rows)} accounts...")
         usernames = []
         skipped_count = 0
 
-        for idx, element in enumerate(follower_elements):
-            try:
-                # Get username - use the unique ID (e.g., @username)
-                username = None
-                try:
-                    # Try to find the username element with class containing "PUniqueId"
-                    username_elem = element.locator('[class*="PUniqueId"]').first
-                    if username_elem.count() > 0:
-                        username = username_elem.inner_text().strip()
-
-                    # Fallback: try data-e2e attribute
-                    if not username:
-                        username_elem = element.locator('[data-e2e="following-username"]')
-                        if username_elem.count() > 0:
-                            username = username_elem.inner_text().strip()
-                except (PlaywrightTimeoutError, Exception) as e:
-                    logger.info(f"   Could not extract username for account {idx}: {e}")
-
-                if username and username not in ['@', '@_']:
-                    # Remove @ symbol if present
-                    username_clean = username.lstrip('@')
-
-                    # Skip if already processed
-                    if username in self.state['processed_accounts']:
-                        skipped_count += 1
-                        if idx < 10:
-                            logger.info(f"   Account {idx}: {username} - already processed (skipped)")
-                        continue
+        for row in follower_rows:
+            idx = row['index']
+            # Username is the unique ID (e.g., @username)
+            username = row['username']
 
-                    usernames.append({'username': username, 'username_clean': username_clean, 'index': idx})
+            if username and username not in ['@', '@_']:
+                # Remove @ symbol if present
+                username_clean = username.lstrip('@')
 
-            except Exception as e:
-                logger.info(f"   Error extracting username for account {idx}: {e}")
-                continue
+                # Skip if already processed
+                if username in self.processed_set:
+                    skipped_count += 1
+                    if idx < 10:
+                        logger.info(f"   Account {idx}: {username} - already processed (skipped)")
+                    continue
+
+                usernames.append({
+                    'username': username,
+                    'username_clean': username_clean,
+                    'index': idx,
+                    'href': row['href']
+                })
+            elif idx < 10:
+                logger.info(f"   Could not extract username for account {idx}")
 
         logger.info(f"   Extracted {len(usernames)} usernames to check ({skipped_count} already processed)")
 
         # Now check each account by visiting their profile
+        # Invalid accounts go to the CSV as they are found. unfollow_batch only handles
+        # BATCH_SIZE per session, so the scan stops once that many are found - accounts
+        # after that point are unchecked and get scanned on a later run
         invalid_accounts = []
+        exported_count = 0
+        checked_count = 0
 
         for i, account_info in enumerate(usernames):
+            checked_count = i + 1
             username = account_info['username']
             username_clean = account_info['username_clean']
             idx = account_info['index']
+            href = account_info['href']
+
+            # A recent invalid verdict (e.g. an unfollow that didn't go through last run) is
+            # reused without visiting the profile again
+            cached_reason = self.cached_verdict(username)
+
+            # Default userXXXX names are flagged from the name alone, so only real profile
+            # visits are paced. Their verdicts are cached all the same, so a default-name account
+            # still waiting to be unfollowed isn't appended to the CSV again every run
+            visits_profile = not cached_reason and not is_default_username(username_clean)
+            if visits_profile:
+                # Pace profile visits to avoid bot detection
+                wait = self.profile_limiter.remaining()
+                if wait > 0:
+                    logger.info(f"      ⏰ Waiting {wait:.0f} seconds before next check (avoiding bot detection)...")
+                self.profile_limiter.acquire()
+                self._wait_out_rate_limit()
 
             try:
-                logger.info(f"   [{i+1}/{len(usernames)}] Checking {username}...")
+                if cached_reason:
+                    logger.info(f"   [{i+1}/{len(usernames)}] {username} - found invalid on a recent check, not re-visiting")
+                    is_invalid, reason = True, cached_reason
+                else:
+                    logger.info(f"   [{i+1}/{len(usernames)}] Checking {username}...")
 
-                # Check if account is invalid by visiting profile
-                is_invalid, reason = self.check_if_account_invalid(username_clean)
+                    # Check if account is invalid by visiting profile
+                    is_invalid, reason = self.check_if_account_invalid(username_clean)
+                    if is_invalid:
+                        self.remember_verdict(username, reason)
+                        self.checkpoint_state()
 
                 if is_invalid:
                     logger.info(f"      ❌ INVALID: {reason}")
-                    invalid_accounts.append({
+                    account = {
                         'username': username,
                         'index': idx,
+                        'href': href,
                         'reason': reason
-                    })
+                    }
+                    invalid_accounts.append(account)
+                    # Cached verdicts were already exported on the run that found them
+                    if not cached_reason and self.export_to_csv(account):
+                        exported_count += 1
+
+                    if len(invalid_accounts) >= BATCH_SIZE:
+                        logger.info(f"   Found {BATCH_SIZE} invalid accounts (BATCH_SIZE) - stopping scan "
+                                    f"after {i+1}/{len(usernames)} checked, the rest wait for the next run")
+                        break
                 else:
                     logger.info(f"      ✓ Valid account")
-
-                # Mark as processed
-                self.state['processed_accounts'].append(username)
-                self.save_state()
-
-                # Add delay between profile checks to avoid bot detection
-                # Add some randomization (±25%) to make it more human-like
-                if i < len(usernames) - 1:  # Don't delay after the last account
-                    randomized_delay = PROFILE_CHECK_DELAY + random.randint(-int(PROFILE_CHECK_DELAY * 0.25), int(PROFILE_CHECK_DELAY * 0.25))
-                    logger.info(f"      ⏰ Waiting {randomized_delay} seconds before next check (avoiding bot detection)...")
-                    time.sleep(randomized_delay)
+                    # Mark as processed - invalid accounts are marked by unfollow_batch once
+                    # handled, so ones beyond this session's batch are picked up next run
+                    self.mark_processed(username)
+                    self.checkpoint_state()
 
             except Exception as e:
-                logger.info(f"   Error checking account {username}: {e}")
+                logger.warning(f"   Error checking account {username}: {e}")
                 continue
 
-        logger.info(f"✓ Found {len(invalid_accounts)} invalid accounts out of {len(usernames)} checked")
-
-        # Export to CSV
-        if invalid_accounts:
-            self.export_to_csv(invalid_accounts)
+        logger.info(f"✓ Found {len(invalid_accounts)} invalid accounts out of {checked_count} checked")
+        if exported_count:
+            logger.info(f"📄 Exported {exported_count} invalid accounts to {CSV_EXPORT_FILE}")
 
         # Navigate back to Following modal before unfollowing
         if invalid_accounts:
             logger.info("📍 Navigating back to Following modal to unfollow invalid accounts...")
+            # navigate_to_following() returns once the modal and its first row are present,
+            # and each row's unfollow button is waited for in unfollow_batch()
             self.navigate_to_following()
-            time.sleep(2)
 
             # Unfollow invalid accounts with rate limiting
             self.unfollow_batch(invalid_accounts)
@@ -981,7 +1631,12 @@ class TikTokUnfollower:
 
     def unfollow_batch(self, accounts):
         """Unfollow accounts in a batch with rate limiting"""
-        batch_size = min(BATCH_SIZE, len(accounts))
+        # Drop already-processed accounts before touching the page, so they cost no
+        # browser calls and don't take up a slot in the batch
+        pending = [account for account in accounts if account['username'] not in self.processed_set]
+        if len(pending) < len(accounts):
+            logger.info(f"   Skipping {len(accounts) - len(pending)} already processed accounts")
+        batch_size = min(BATCH_SIZE, len(pending))
 
         if DRY_RUN:
             logger.info(f"🧪 DRY RUN MODE: Would unfollow {batch_size} accounts (limited to {BATCH_SIZE} per session)...")
@@ -989,80 +1644,86 @@ class TikTokUnfollower:
         else:
             logger.info(f"🚫 Unfollowing {batch_size} accounts (limited to {BATCH_SIZE} per session)...")
 
+        # Locators are lazy, so one modal locator serves every row - each use re-resolves
+        # it against the live DOM, which also keeps re-rendered rows from going stale
+        modal = self.following_modal
+
         unfollowed = 0
-        for account in accounts[:batch_size]:
+        for account in pending[:batch_size]:
             try:
                 username = account['username']
-                account_index = account['index']
 
-                # Check if we've already processed this account
-                if username in self.state['processed_accounts']:
-                    logger.info(f"   Skipping {username} (already processed)")
+                # Locate the row by its profile link instead of its position in the list
+                # Positions shift when the modal is reopened or re-renders, so a row without a
+                # usable link is skipped - clicking by index could unfollow a different account
+                profile_href = account.get('href')
+                if not profile_href or '"' in profile_href:
+                    logger.warning(f"   ⚠️  No profile link to locate {username} by")
+                    self.record_unfollow_failure(username)
                     continue
+                element = modal.locator(f'li:has(a[href="{profile_href}"])').first
 
-                # Re-query the element from modal to avoid stale element issues
-                # Elements can become stale after page changes
-                try:
-                    modal = self.page.locator('[role="dialog"][data-e2e="follow-info-popup"]')
-                    follower_items = modal.locator('li')
-
-                    if account_index >= follower_items.count():
-                        logger.info(f"   ⚠️  Account index out of range for: {username}")
-                        continue
-
-                    element = follower_items.nth(account_index)
-                except Exception as e:
-                    logger.info(f"   ⚠️  Could not re-query element for {username}: {e}")
+                # The reopened modal only has its first rows loaded - scroll until this one is
+                if not self._scroll_to_row(element):
+                    logger.warning(f"   ⚠️  Could not find {username} in the following list")
+                    self.record_unfollow_failure(username)
                     continue
 
-                # Find and click the following/unfollow button
+                # Find the following/unfollow button
                 # The button has data-e2e="follow-button" and text "Following"
+                # One wait with a short timeout replaces a count() probe per selector
+                unfollow_button = element.locator(
+                    'button[data-e2e="follow-button"], button:has-text("Following")'
+                ).first
                 try:
-                    # Try the data-e2e selector first
-                    unfollow_button = element.locator('button[data-e2e="follow-button"]').first
+                    unfollow_button.wait_for(state='attached', timeout=3000)
+                except PlaywrightTimeoutError:
+                    logger.warning(f"   ⚠️  Could not find unfollow button for: {username}")
+                    self.record_unfollow_failure(username)
+                    continue
 
-                    # Fallback: filter by text
-                    if unfollow_button.count() == 0:
-                        unfollow_button = element.locator('button').filter(has_text='Following').first
+                if DRY_RUN:
+                    # Dry run mode - don't actually click, just bring the row into view
+                    # scroll_into_view_if_needed() waits for the row to be stable, so no sleep after it
+                    element.scroll_into_view_if_needed()
+                    logger.info(f"   🧪 Would unfollow: {username}")
+                else:
+                    self._wait_out_rate_limit()
+                    self.unfollow_limiter.acquire()
+                    result = self._click_unfollow(unfollow_button, username)
+                    if result == 'throttled':
+                        logger.warning("   🛑 TikTok is still rate limiting - stopping this batch early")
+                        break
+                    if result == 'already':
+                        # Nothing was clicked, so this is neither logged nor counted as an unfollow
+                        logger.info(f"   ⏭️  Already not following: {username}")
+                        self.mark_processed(username)
+                        self.checkpoint_state()
+                        continue
+                    if result != 'done':
+                        logger.warning(f"   ⚠️  Unfollow not confirmed for: {username} (will retry next run)")
+                        self.record_unfollow_failure(username)
+                        continue
 
-                    if unfollow_button.count() > 0:
-                        # Scroll element into view
-                        element.scroll_into_view_if_needed()
-                        time.sleep(1)
+                    logger.info(f"   ✓ Unfollowed: {username}")
 
-                        if DRY_RUN:
-                            # Dry run mode - don't actually click
-                            logger.info(f"   🧪 Would unfollow: {username}")
-                        else:
-                            # Click unfollow
-                            unfollow_button.click()
-                            time.sleep(ACTION_DELAY)
-                            logger.info(f"   ✓ Unfollowed: {username}")
-
-                        # Track in state (even in dry run, to avoid re-scanning same accounts)
-                        self.state['processed_accounts'].append(username)
-                        if not DRY_RUN:
-                            self.state['unfollowed_accounts'].append({
-                                'username': username,
-                                'timestamp': datetime.now().isoformat()
-                            })
-                        self.save_state()
-
-                        unfollowed += 1
-                    else:
-                        logger.info(f"   ⚠️  Could not find unfollow button for: {username}")
-                except PlaywrightTimeoutError:
-                    logger.info(f"   ⚠️  Timeout finding unfollow button for: {username}")
-                    continue
+                # Track in state (even in dry run, to avoid re-scanning same accounts)
+                self.mark_processed(username)
+                if not DRY_RUN:
+                    self.record_unfollow(username)
+                self.checkpoint_state()
+
+                unfollowed += 1
 
             except Exception as e:
-                logger.info(f"   Error unfollowing {account['username']}: {e}")
+                logger.warning(f"   Error unfollowing {account['username']}: {e}")
+                self.record_unfollow_failure(account['username'])
                 continue
 
         logger.info(f"✓ Unfollowed {unfollowed} accounts this session")
 
         # Update last run time
-        self.state['last_run'] = datetime.now().isoformat()
+        self.state['last_run'] = time.time()
         self.save_state()
 
         # Calculate next run time
@@ -1070,25 +1731,128 @@ class TikTokUnfollower:
         logger.info(f"⏰ Next run scheduled for: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info(f"   ({UNFOLLOW_DELAY/3600:.1f} hours from now)")
 
+    def _scroll_to_row(self, row):
+        """
+        Scroll the following modal until a row locator is attached, reusing SCROLL_FOLLOWERS_JS.
+        Returns False if the list stops growing (or SCROLL_TIME_LIMIT passes) first
+        """
+        total = self.following_modal.locator('li').count()
+        deadline = time.monotonic() + SCROLL_TIME_LIMIT
+        while row.count() == 0:
+            if time.monotonic() > deadline:
+                return False
+            # Starting at the current total harvests only the rows this burst adds
+            previous_total = total
+            total = self.page.evaluate(SCROLL_FOLLOWERS_JS, {
+                'idleMs': SCROLL_WAIT_MAX_MS,
+                'burstMs': SCROLL_BURST_MS,
+                'startIndex': previous_total,
+                'limit': 0
+            })['total']
+            if total <= previous_total:
+                return False
+        return True
+
+    def _click_unfollow(self, unfollow_button, username):
+        """
+        Click an unfollow button and confirm it took effect, backing off while TikTok throttles.
+        Returns 'done', 'already' (button already reads "Follow"), 'unconfirmed' or 'throttled'
+        """
+        # Pin the resolved button and read its label ("Following", "Friends", ...) before clicking,
+        # so the confirmation watches this button's label change instead of a text selector that
+        # may never have matched it
+        button = unfollow_button.element_handle()
+        label = button.inner_text().strip()
+        if label == 'Follow':
+            # Already not following (e.g. a click from an earlier run landed late) - clicking
+            # now would follow the account again
+            return 'already'
+
+        for attempt in range(UNFOLLOW_RETRIES + 1):
+            # click() scrolls the button into view and waits until it is actionable,
+            # so no separate scroll + sleep is needed
+            button.click()
+
+            # Confirm the button's label changed before recording the unfollow
+            try:
+                outcome = self.page.wait_for_function(
+                    BUTTON_LABEL_CHANGED_JS, arg=[button, label], timeout=5000
+                ).json_value()
+                return 'done' if outcome == 'changed' else 'unconfirmed'
+            except PlaywrightTimeoutError:
+                pass
+
+            if self.page.locator(THROTTLE_TOAST_SELECTOR).count() == 0:
+                return 'unconfirmed'
+
+            if attempt == UNFOLLOW_RETRIES:
+                break
+
+            delay = min(THROTTLE_BACKOFF_CAP, (2 ** attempt) * ACTION_DELAY)
+            logger.info(f"   ⏳ Rate limited while unfollowing {username} - retrying in {delay} seconds...")
+            time.sleep(delay)
+
+            # The click may have landed late - don't toggle the follow back on
+            outcome = self.page.evaluate(BUTTON_LABEL_CHANGED_JS, [button, label])
+            if outcome == 'changed':
+                return 'done'
+            if outcome == 'detached':
+                return 'unconfirmed'
+
+        return 'throttled'
+
+    def run_cycle(self):
+        """One pass: open the following modal, load it, check accounts and unfollow invalid ones"""
+        self.navigate_to_following()
+        self.scroll_and_load_followers()
+        self.unfollow_invalid_accounts()
+
+        logger.info("\n✅ Script completed successfully!")
+        logger.info(f"📊 Total accounts unfollowed: {self.state['unfollowed_total']}")
+
+    def wait_for_next_cycle(self, wait_time):
+        """Sleep until the next daemon cycle, with state flushed in case the process is stopped"""
+        if self.unsaved_changes:
+            self.save_state()
+        next_run = datetime.now() + timedelta(seconds=wait_time)
+        logger.info(f"💤 Daemon mode: sleeping until {next_run.strftime('%Y-%m-%d %H:%M:%S')} ({wait_time/3600:.1f} hours)")
+        # Get the finished cycle's buffered log lines onto disk before going idle for hours
+        for handler in logger.handlers:
+            handler.flush()
+        time.sleep(wait_time)
+
     def cleanup(self):
         """Clean up browser resources"""
-        try:
-            if self.context:
-                self.context.close()
-        except Exception as e:
-            logger.info(f"   Warning: Error closing context: {e}")
+        if not self.owns_browser:
+            # Attached over CDP - close only our tab and leave the browser running
+            try:
+                if self.page:
+                    self.page.close()
+            except Exception as e:
+                logger.warning(f"   Warning: Error closing page: {e}")
+
+            try:
+                if self.playwright:
+                    self.playwright.stop()
+            except Exception as e:
+                logger.warning(f"   Warning: Error stopping playwright: {e}")
+            return
 
+        # Closing the browser closes its contexts too, so the context only needs
+        # closing on its own when there's no browser to close
         try:
             if self.browser:
                 self.browser.close()
+            elif self.context:
+                self.context.close()
         except Exception as e:
-            logger.info(f"   Warning: Error closing browser: {e}")
+            logger.warning(f"   Warning: Error closing browser: {e}")
 
         try:
             if self.playwright:
                 self.playwright.stop()
         except Exception as e:
-            logger.info(f"   Warning: Error stopping playwright: {e}")
+            logger.warning(f"   Warning: Error stopping playwright: {e}")
 
     def run(self):
         """Main execution flow"""
@@ -1096,43 +1860,73 @@ class TikTokUnfollower:
             # Validate credentials based on login method
             if LOGIN_METHOD == 'email':
                 if not TIKTOK_USERNAME or not TIKTOK_PASSWORD:
-                    logger.info("❌ Error: Please set TIKTOK_USERNAME and TIKTOK_PASSWORD in .env file")
+                    logger.error("❌ Error: Please set TIKTOK_USERNAME and TIKTOK_PASSWORD in .env file")
                     logger.info("   (Required for email login method)")
                     return
             # For Google login, credentials are handled through OAuth (no need to check)
 
-            if not self.should_run():
+            if not DAEMON and not self.should_run():
                 return
 
             self.setup_browser()
             self.login()
             # Save session after successful login
             self.save_session_state()
-            self.navigate_to_following()
-            self.scroll_and_load_followers()
-            self.unfollow_invalid_accounts()
 
-            logger.info("\n✅ Script completed successfully!")
-            logger.info(f"📊 Total accounts unfollowed: {len(self.state['unfollowed_accounts'])}")
+            if not DAEMON:
+                self.run_cycle()
+                return
+
+            # Daemon mode: the browser stays open and logged in between cycles
+            wait_time = self.seconds_until_next_run()
+            cycle = 0
+            while True:
+                if wait_time > 0:
+                    self.wait_for_next_cycle(wait_time)
+
+                cycle += 1
+                logger.info(f"\n🔁 Starting cleanup cycle {cycle}")
+                try:
+                    if wait_time > 0:
+                        # Start each later cycle from the home page, where navigation expects to be,
+                        # and log in again if the cookies expired while the daemon slept
+                        if not self._is_logged_in_from_session():
+                            self._run_login_flow()
+                    self.run_cycle()
+                    # Keep session.json in step with the cookies TikTok refreshed during the cycle
+                    self.save_session_state()
+                except Exception as e:
+                    logger.error(f"\n❌ Cycle {cycle} failed: {e} - will retry next cycle")
+
+                # Also covers cycles that found nothing to unfollow (last_run unchanged)
+                wait_time = max(UNFOLLOW_DELAY, 60)
 
         except KeyboardInterrupt:
-            logger.info("\n\n⚠️  Script interrupted by user (Ctrl+C)")
+            logger.warning("\n\n⚠️  Script interrupted by user (Ctrl+C)")
             logger.info("   Progress has been saved. You can run the script again later.")
             return
 
         except Exception as e:
-            logger.info(f"\n❌ Error occurred: {e}")
+            logger.error(f"\n❌ Error occurred: {e}")
             import traceback
             traceback.print_exc()
             return
 
         finally:
+            # Flush anything not yet written by checkpoint_state() (e.g. after Ctrl+C mid-batch)
+            if self.unsaved_changes:
+                self.save_state()
+
             if self.browser or self.context or self.playwright:
                 logger.info("\n🔄 Closing browser...")
-                time.sleep(1)
                 self.cleanup()
 
 
+def handle_sigterm(signum, frame):
+    """Treat SIGTERM (e.g. systemd stop) like Ctrl+C so state is flushed and the browser closed"""
+    raise KeyboardInterrupt
+
+
 def main():
     logger.info("=" * 60)
     logger.info("TikTok Follower Cleanup Script")
@@ -1147,6 +1941,8 @@ def main():
 
     logger.info("")
 
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
     unfollower = TikTokUnfollower()
     unfollower.run()
 